@@ -2,10 +2,15 @@ import asyncio
 import json
 import logging
 import os
+import sys
 import hashlib
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from collections import defaultdict, deque
+from typing import Optional, Dict, Any, List, Tuple, Union
+from zoneinfo import ZoneInfo
 import aiohttp
 from aiohttp import web
 import socket
@@ -13,11 +18,16 @@ import socket
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import (
 Application, CommandHandler, MessageHandler,
-ContextTypes, ConversationHandler, filters
+ContextTypes, ConversationHandler, AIORateLimiter, filters
 )
 from telegram.error import TelegramError
 from telegram.constants import ParseMode
 
+try:
+import orjson
+except ImportError:
+orjson = None
+
 # Налаштування логування
 
 logging.basicConfig(
@@ -36,22 +46,40 @@ HEALTHCHECK_PORT = int(os.getenv(‘HEALTHCHECK_PORT’, ‘8080’))
 DEBOUNCE_SECONDS = int(os.getenv(‘DEBOUNCE_SECONDS’, ‘300’))
 RATE_LIMIT_COMMANDS = int(os.getenv(‘RATE_LIMIT_COMMANDS’, ‘10’))
 RATE_LIMIT_WINDOW = int(os.getenv(‘RATE_LIMIT_WINDOW’, ‘60’))
+KYIV_TZ = ZoneInfo(‘Europe/Kyiv’)
 
 # Константи для мониторинга графіків
 
 GRAPHENKO_CHECK_INTERVAL = int(os.getenv(‘GRAPHENKO_CHECK_INTERVAL’, ‘300’))  # 5 хвилин
 MAX_RETRIES = int(os.getenv(‘MAX_RETRIES’, ‘3’))
 RETRY_DELAY = int(os.getenv(‘RETRY_DELAY’, ‘10’))
+FETCH_CONCURRENCY = int(os.getenv(‘FETCH_CONCURRENCY’, ‘8’))
+NOT_MODIFIED = object()  # fetch_image: сервер відповів 304
 
 # Константи для меню
 
 (SELECTING_ACTION, ADDING_CHANNEL, WAITING_CHAT_ID, WAITING_IMAGE_URL,
 WAITING_CAPTION, WAITING_REGION, WAITING_GROUP) = range(7)
 
+# Клавіатури не змінюються, тому створюємо їх один раз
+
+MAIN_MENU_MARKUP = ReplyKeyboardMarkup([
+[‘📊 Додати канал’, ‘⚙️ Налаштування’],
+[‘📜 Мої канали’, ‘📋 Довідка’],
+[‘☎️ Підтримка’]
+], resize_keyboard=True)
+CAPTION_MENU_MARKUP = ReplyKeyboardMarkup([
+[‘📝 Власний підпис’],
+[‘➕ Стандартний підпис’]
+], resize_keyboard=True)
+
 CONFIG_FILE = ‘graphenko-chats.json’
 BACKUP_DIR = ‘backups’
+MAX_BACKUPS = 10
+SAVE_DELAY = 1.0  # секунд: зміни конфігурації записуються пакетом
 app = None
 http_runner = None
+monitor_task = None
 
 class GraphenkoConfig:
 “”“Клас для роботи з конфігурацією”””
@@ -61,44 +89,90 @@ def __init__(self, filepath: str = CONFIG_FILE):
     self.filepath = filepath
     self.backup_dir = Path(BACKUP_DIR)
     self.backup_dir.mkdir(exist_ok=True)
-    self.lock = asyncio.Lock()
+    
+    # Бекапи відстежуємо в пам'яті, щоб не сканувати каталог при кожному збереженні
+    backups = sorted(self.backup_dir.glob('backup_*.json'))
+    for old_backup in backups[:-MAX_BACKUPS]:
+        old_backup.unlink()
+    self._backup_ring = deque(backups[-MAX_BACKUPS:], maxlen=MAX_BACKUPS)
+    self._last_saved: Optional[bytes] = None
+    
+    self._dirty = False
+    self._flush_handle: Optional[asyncio.TimerHandle] = None
+    self._channels_text: Optional[str] = None
     self.load()
 
 def load(self):
     """Завантажити конфігурацію з файлу"""
+    self._channels_text = None
     try:
         if Path(self.filepath).exists():
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            with open(self.filepath, 'rb') as f:
+                raw = f.read()
+            self.data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            self.data['chats'] = {
+                sys.intern(chat_id): chat_data
+                for chat_id, chat_data in self.data.get('chats', {}).items()
+            }
         else:
             self.data = {'chats': {}}
-            self.save()
+            self._dirty = True
+            self.flush()
     except Exception as e:
         logger.error(f"Помилка при завантаженні конфігурації: {e}")
         self.data = {'chats': {}}
 
 async def save(self):
-    """Зберегти конфігурацію в файл"""
-    async with self.lock:
-        try:
-            # Створити бекап
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_file = self.backup_dir / f'backup_{timestamp}.json'
-            if Path(self.filepath).exists():
-                import shutil
-                shutil.copy2(self.filepath, backup_file)
-            
-            # Видалити старі бекапи (залишити останніх 10)
-            backups = sorted(self.backup_dir.glob('backup_*.json'))
-            for old_backup in backups[:-10]:
-                old_backup.unlink()
+    """Позначити конфігурацію зміненою і запланувати запис у файл
+    
+    Усі збереження протягом SAVE_DELAY секунд об'єднуються в один запис.
+    """
+    self._dirty = True
+    if self._flush_handle is None:
+        self._flush_handle = asyncio.get_running_loop().call_later(SAVE_DELAY, self.flush)
+
+def flush(self):
+    """Записати незбережені зміни конфігурації у файл"""
+    if self._flush_handle is not None:
+        self._flush_handle.cancel()
+        self._flush_handle = None
+    if not self._dirty:
+        return
+    
+    try:
+        if orjson is not None:
+            content = orjson.dumps(self.data, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(self.data, ensure_ascii=False, indent=2).encode('utf-8')
+        if content == self._last_saved:
+            # Нічого не змінилось - ні бекапу, ні запису
+            self._dirty = False
+            return
+        
+        # Створити бекап
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_file = self.backup_dir / f'backup_{timestamp}.json'
+        if Path(self.filepath).exists():
+            import shutil
+            shutil.copy2(self.filepath, backup_file)
             
-            # Зберегти конфігурацію
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            logger.info("Конфігурація успішно збережена")
-        except Exception as e:
-            logger.error(f"Помилка при збереженні конфігурації: {e}")
+            # Видалити найстаріший бекап (залишити останніх MAX_BACKUPS)
+            if backup_file not in self._backup_ring:
+                if len(self._backup_ring) == self._backup_ring.maxlen:
+                    self._backup_ring[0].unlink(missing_ok=True)
+                self._backup_ring.append(backup_file)
+        
+        # Зберегти конфігурацію атомарно: тимчасовий файл + підміна
+        tmp_path = f'{self.filepath}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, self.filepath)
+        self._last_saved = content
+        # Прапорець знімається лише після успішного запису, щоб наступний flush повторив спробу
+        self._dirty = False
+        logger.info("Конфігурація успішно збережена")
+    except Exception as e:
+        logger.error(f"Помилка при збереженні конфігурації: {e}")
 
 def get_chat(self, chat_id: str) -> Dict[str, Any]:
     """Отримати дані чату"""
@@ -106,12 +180,28 @@ def get_chat(self, chat_id: str) -> Dict[str, Any]:
 
 def set_chat(self, chat_id: str, data: Dict[str, Any]):
     """Встановити дані чату"""
-    self.data['chats'][str(chat_id)] = data
+    self.data['chats'][sys.intern(str(chat_id))] = data
+    self._channels_text = None
 
 def delete_chat(self, chat_id: str):
     """Видалити чат з конфігурації"""
     if str(chat_id) in self.data['chats']:
         del self.data['chats'][str(chat_id)]
+        self._channels_text = None
+
+def channels_text(self) -> str:
+    """Текст списку каналів (кешується до наступної зміни чатів)"""
+    if self._channels_text is None:
+        parts = ["📜 Ваші канали:\n\n"]
+        for chat_id, data in self.data['chats'].items():
+            added_date = data.get('added_date', 'N/A')
+            parts.append(
+                f"🔹 {chat_id}\n"
+                f"   📅 Додано: {added_date}\n"
+                f"   🖼️ URL: {data.get('image_url', 'N/A')[:50]}...\n\n"
+            )
+        self._channels_text = ''.join(parts)
+    return self._channels_text
 ```
 
 class GraphenkoMonitor:
@@ -121,42 +211,100 @@ class GraphenkoMonitor:
 def __init__(self, config: GraphenkoConfig):
     self.config = config
     self.image_hashes = {}
+    self.url_hashes: Dict[str, bytes] = {}
+    # URL -> валідатори (ETag, Last-Modified) відповіді, з якої пораховано url_hashes[url]
+    self.validators: Dict[str, Dict[str, str]] = {}
     self.last_update_time = {}
     self.session: Optional[aiohttp.ClientSession] = None
+    self.default_timeout = aiohttp.ClientTimeout(total=30)
+    self.fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
 
 async def init_session(self):
     """Ініціалізувати HTTP сесію"""
     if self.session is None:
-        self.session = aiohttp.ClientSession()
+        # Пул з'єднань і DNS-кеш переживають інтервал між перевірками
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            keepalive_timeout=GRAPHENKO_CHECK_INTERVAL * 2,
+            ttl_dns_cache=GRAPHENKO_CHECK_INTERVAL,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
 
 async def close_session(self):
     """Закрити HTTP сесію"""
     if self.session:
         await self.session.close()
+        self.session = None
 
-async def fetch_image(self, url: str, retries: int = MAX_RETRIES) -> Optional[bytes]:
-    """Завантажити зображення з URL"""
+async def fetch_image(self, url: str, retries: int = MAX_RETRIES,
+                      validators: Optional[Dict[str, str]] = None) -> Union[bytes, object, None]:
+    """Завантажити зображення з URL
+    
+    Якщо передано validators, запит умовний (If-None-Match /
+    If-Modified-Since з validators)
+    і на 304 повертається NOT_MODIFIED; після відповіді 200 словник
+    validators оновлюється заголовками нової відповіді. Зберігати їх -
+    справа того, хто викликає, разом з хешем цих даних.
+    """
     await self.init_session()
     
+    headers = {}
+    if validators:
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+    
     for attempt in range(retries):
         try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            async with self.session.get(url, headers=headers, timeout=self.default_timeout) as resp:
+                if resp.status == 304 and headers:
+                    return NOT_MODIFIED
                 if resp.status == 200:
+                    if validators is not None:
+                        validators.clear()
+                        etag = resp.headers.get('ETag')
+                        if etag:
+                            validators['etag'] = etag
+                        last_modified = resp.headers.get('Last-Modified')
+                        if last_modified:
+                            validators['last_modified'] = last_modified
                     return await resp.read()
-                logger.warning(f"HTTP {resp.status} при завантаженні {url}")
+                logger.warning("HTTP %s при завантаженні %s", resp.status, url)
         except asyncio.TimeoutError:
-            logger.warning(f"Timeout при завантаженні {url} (спроба {attempt + 1}/{retries})")
+            logger.warning("Timeout при завантаженні %s (спроба %d/%d)", url, attempt + 1, retries)
         except Exception as e:
-            logger.error(f"Помилка при завантаженні {url}: {e}")
+            logger.error("Помилка при завантаженні %s: %s", url, e)
         
         if attempt < retries - 1:
             await asyncio.sleep(RETRY_DELAY)
     
     return None
 
-def calculate_hash(self, data: bytes) -> str:
+async def check_url(self, url: str) -> Optional[Tuple[Optional[bytes], bytes]]:
+    """Завантажити зображення і повернути (дані, хеш); None при помилці
+    
+    Якщо сервер відповів 304, дані - None, а хеш береться з кешу.
+    """
+    # Умовний запит - лише якщо є хеш, до якого належать валідатори
+    validators = dict(self.validators.get(url, {})) if url in self.url_hashes else {}
+    async with self.fetch_semaphore:
+        image_data = await self.fetch_image(url, validators=validators)
+    
+    if image_data is NOT_MODIFIED:
+        return None, self.url_hashes[url]
+    if not image_data:
+        return None
+    
+    current_hash = self.calculate_hash(image_data)
+    self.url_hashes[url] = current_hash
+    self.validators[url] = validators
+    return image_data, current_hash
+
+def calculate_hash(self, data: bytes) -> bytes:
     """Розрахувати SHA256 хеш зображення"""
-    return hashlib.sha256(data).hexdigest()
+    return hashlib.sha256(data).digest()
 
 async def check_updates(self) -> Dict[str, list]:
     """Перевірити оновлення всіх графіків"""
@@ -166,21 +314,40 @@ async def check_updates(self) -> Dict[str, list]:
         'errors': []
     }
     
+    # Групуємо чати за URL, щоб завантажувати кожне зображення один раз
+    url_to_chats: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
     for chat_id, chat_data in self.config.data['chats'].items():
         image_url = chat_data.get('image_url')
-        if not image_url:
+        if image_url:
+            url_to_chats[image_url].append((chat_id, chat_data))
+    
+    # Завантажуємо всі URL паралельно (не більше FETCH_CONCURRENCY одночасно)
+    urls = list(url_to_chats)
+    results = await asyncio.gather(
+        *(self.check_url(url) for url in urls),
+        return_exceptions=True
+    )
+    
+    for image_url, result in zip(urls, results):
+        chats = url_to_chats[image_url]
+        if isinstance(result, Exception):
+            for chat_id, _ in chats:
+                logger.error("Помилка при перевірці графіка для %s: %s", chat_id, result)
+                updates['errors'].append({
+                    'chat_id': chat_id,
+                    'reason': str(result)
+                })
             continue
-        
-        try:
-            image_data = await self.fetch_image(image_url)
-            if not image_data:
+        if result is None:
+            for chat_id, _ in chats:
                 updates['errors'].append({
                     'chat_id': chat_id,
                     'reason': 'Не вдалося завантажити зображення'
                 })
-                continue
-            
-            current_hash = self.calculate_hash(image_data)
+            continue
+        
+        image_data, current_hash = result
+        for chat_id, chat_data in chats:
             prev_hash = self.image_hashes.get(chat_id)
             
             if prev_hash is None:
@@ -193,7 +360,7 @@ async def check_updates(self) -> Dict[str, list]:
                 })
             elif prev_hash != current_hash:
                 # Графік оновлено!
-                logger.info(f"Графік оновлено для чату {chat_id}")
+                logger.info("Графік оновлено для чату %s", chat_id)
                 self.image_hashes[chat_id] = current_hash
                 self.last_update_time[chat_id] = datetime.now()
                 updates['updated'].append({
@@ -202,14 +369,7 @@ async def check_updates(self) -> Dict[str, list]:
                     'chat_data': chat_data
                 })
             else:
-                logger.debug(f"Графік без змін для чату {chat_id}")
-        
-        except Exception as e:
-            logger.error(f"Помилка при перевірці графіка для {chat_id}: {e}")
-            updates['errors'].append({
-                'chat_id': chat_id,
-                'reason': str(e)
-            })
+                logger.debug("Графік без змін для чату %s", chat_id)
     
     return updates
 ```
@@ -225,18 +385,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 user_id = update.effective_user.id
 
 ```
-keyboard = [
-    ['📊 Додати канал', '⚙️ Налаштування'],
-    ['📜 Мої канали', '📋 Довідка'],
-    ['☎️ Підтримка']
-]
-reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-
 await update.message.reply_text(
     f"Привіт, {update.effective_user.first_name}! 👋\n\n"
     f"Я допоможу тобі автоматично оновлювати графіки відключень ДТЕК в каналі.\n\n"
     f"Що ти хочеш зробити?",
-    reply_markup=reply_markup
+    reply_markup=MAIN_MENU_MARKUP
 )
 return SELECTING_ACTION
 ```
@@ -309,16 +462,10 @@ if not image_data:
 context.user_data['image_url'] = url
 context.user_data['image_hash'] = monitor.calculate_hash(image_data)
 
-keyboard = [
-    ['📝 Власний підпис'],
-    ['➕ Стандартний підпис']
-]
-reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-
 await update.message.reply_text(
     "✅ URL перевірена!\n\n"
     "Тепер виберіть підпис для повідомлення:",
-    reply_markup=reply_markup
+    reply_markup=CAPTION_MENU_MARKUP
 )
 return WAITING_CAPTION
 ```
@@ -346,7 +493,7 @@ chat_id = context.user_data['chat_id']
 config.set_chat(chat_id, {
     'image_url': context.user_data['image_url'],
     'caption': context.user_data.get('caption', get_default_caption()),
-    'added_date': datetime.now().isoformat(),
+    'added_date': datetime.now(KYIV_TZ).isoformat(),
     'added_by': update.effective_user.id
 })
 await config.save()
@@ -354,18 +501,11 @@ await config.save()
 # Завантажити зображення в канал
 await send_graph_to_channel(context.bot, chat_id, context.user_data)
 
-keyboard = [
-    ['📊 Додати канал', '⚙️ Налаштування'],
-    ['📜 Мої канали', '📋 Довідка'],
-    ['☎️ Підтримка']
-]
-reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-
 await update.message.reply_text(
     f"✅ Канал успішно додано!\n"
     f"ID: {chat_id}\n\n"
     f"Графік буде автоматично оновлюватися кожні {GRAPHENKO_CHECK_INTERVAL // 60} хвилин.",
-    reply_markup=reply_markup
+    reply_markup=MAIN_MENU_MARKUP
 )
 
 # Очистити user_data
@@ -380,39 +520,34 @@ await update.message.reply_text(“📭 Каналів ще не додано”
 return SELECTING_ACTION
 
 ```
-message = "📜 Ваші канали:\n\n"
-for chat_id, data in config.data['chats'].items():
-    added_date = data.get('added_date', 'N/A')
-    message += f"🔹 {chat_id}\n"
-    message += f"   📅 Додано: {added_date}\n"
-    message += f"   🖼️ URL: {data.get('image_url', 'N/A')[:50]}...\n\n"
-
-await update.message.reply_text(message)
+await update.message.reply_text(config.channels_text())
 return SELECTING_ACTION
 ```
 
 def get_default_caption() -> str:
 “”“Отримати стандартний підпис”””
+return _caption_for_minute(int(time.time()) // 60)
+
+@lru_cache(maxsize=2)
+def _caption_for_minute(minute: int) -> str:
+“”“Стандартний підпис для хвилини від epoch (кешується в межах хвилини)”””
 tz = ‘Europe/Kyiv’
-now = datetime.now()
+now = datetime.fromtimestamp(minute * 60, KYIV_TZ)
 timestamp = now.strftime(’%d.%m.%Y %H:%M’)
 return f”📊 Графік ДТЕК\n⏰ Оновлено: {timestamp} ({tz})\n\n🔄 Оновлення кожні 5 хвилин”
 
-async def send_graph_to_channel(bot, chat_id: str, data: dict):
+async def send_graph_to_channel(bot, chat_id: str, data: dict, image_data: Optional[bytes] = None):
 “”“Надіслати графік в канал”””
 try:
 image_url = data.get(‘image_url’)
 caption = data.get(‘caption’, get_default_caption())
 
 ```
-    # Додаємо cache-busting параметр
-    cache_bust = f"?v={datetime.now().timestamp()}"
-    final_url = f"{image_url}{cache_bust}" if '?' not in image_url else f"{image_url}&v={datetime.now().timestamp()}"
-    
-    # Завантажуємо зображення
-    image_data = await monitor.fetch_image(image_url)
+    # Завантажуємо зображення, якщо його не передали з перевірки
+    if image_data is None:
+        image_data = await monitor.fetch_image(image_url)
     if not image_data:
-        logger.error(f"Не вдалося завантажити графік для {chat_id}")
+        logger.error("Не вдалося завантажити графік для %s", chat_id)
         return
     
     # Надсилаємо в канал
@@ -427,11 +562,11 @@ caption = data.get(‘caption’, get_default_caption())
     try:
         await message.pin(disable_notification=True)
     except TelegramError as e:
-        logger.warning(f"Не вдалося закріпити повідомлення: {e}")
+        logger.warning("Не вдалося закріпити повідомлення: %s", e)
     
-    logger.info(f"Графік успішно надіслано в канал {chat_id}")
+    logger.info("Графік успішно надіслано в канал %s", chat_id)
 except Exception as e:
-    logger.error(f"Помилка при надісланні графіка в {chat_id}: {e}")
+    logger.error("Помилка при надісланні графіка в %s: %s", chat_id, e)
 ```
 
 async def monitor_graphs_task(application: Application):
@@ -447,26 +582,25 @@ try:
         logger.info("Перевіряю оновлення графіків...")
         updates = await monitor.check_updates()
         
-        # Обробляємо оновлені графіки
+        # Обробляємо оновлені графіки: графіки в канали і сповіщення адміну
+        # надсилаємо паралельно; помилка сповіщення не повинна зупиняти цикл
+        sends = []
         for item in updates['updated']:
-            await send_graph_to_channel(
+            sends.append(send_graph_to_channel(
                 application.bot,
                 item['chat_id'],
-                item['chat_data']
-            )
-            
-            # Надсилаємо сповіщення до адміна
-            try:
-                await application.bot.send_message(
-                    chat_id=ADMIN_USER_ID,
-                    text=f"📢 Графік оновлено!\nКанал: {item['chat_id']}"
-                )
-            except:
-                pass
+                item['chat_data'],
+                item['image_data']
+            ))
+            sends.append(application.bot.send_message(
+                chat_id=ADMIN_USER_ID,
+                text=f"📢 Графік оновлено!\nКанал: {item['chat_id']}"
+            ))
+        await asyncio.gather(*sends, return_exceptions=True)
         
         # Логуємо помилки
         for error in updates['errors']:
-            logger.warning(f"Помилка для {error['chat_id']}: {error['reason']}")
+            logger.warning("Помилка для %s: %s", error['chat_id'], error['reason'])
 
 except asyncio.CancelledError:
     logger.info("Задача моніторингу припинена")
@@ -481,7 +615,7 @@ async def healthcheck_handler(request):
 return web.json_response({
 ‘status’: ‘ok’,
 ‘version’: ‘3.0.0’,
-‘timestamp’: datetime.now().isoformat(),
+‘timestamp’: datetime.now(KYIV_TZ).isoformat(),
 ‘chats_count’: len(config.data[‘chats’]),
 ‘monitoring’: bool(monitor.image_hashes)
 })
@@ -491,11 +625,12 @@ async def post_init(application: Application):
 logger.info(“Бот запущен”)
 
 ```
-# Запустити моніторинг графіків
-asyncio.create_task(monitor_graphs_task(application))
+global http_runner, monitor_task
+
+# Запустити моніторинг графіків (зберігаємо посилання, щоб задачу не зібрав GC)
+monitor_task = asyncio.create_task(monitor_graphs_task(application))
 
 # Запустити HTTP сервер для healthcheck
-global http_runner
 app = web.Application()
 app.router.add_get('/health', healthcheck_handler)
 app.router.add_get('/', healthcheck_handler)
@@ -510,9 +645,17 @@ logger.info(f"HTTP сервер запущен на порту {HEALTHCHECK_PORT
 async def post_stop(application: Application):
 “”“Очистка при зупинці бота”””
 logger.info(“Бот зупинається”)
-await monitor.close_session()
 
 ```
+# Спочатку зупинити моніторинг, потім закрити сесію, якою він користується
+if monitor_task:
+    monitor_task.cancel()
+    await asyncio.gather(monitor_task, return_exceptions=True)
+await monitor.close_session()
+
+# Записати відкладені зміни конфігурації
+config.flush()
+
 if http_runner:
     await http_runner.cleanup()
 ```
@@ -524,21 +667,23 @@ logger.error(“BOT_TOKEN не встановлено!”)
 return
 
 ```
-# Створюємо Application
-application = Application.builder().token(BOT_TOKEN).build()
+# Створюємо Application; AIORateLimiter тримає відправку в межах лімітів Telegram
+application = Application.builder().token(BOT_TOKEN).rate_limiter(AIORateLimiter()).build()
+
+# Обробники кнопок меню (спільні для входу та стану SELECTING_ACTION)
+menu_handlers = [
+    MessageHandler(filters.TEXT & filters.Regex('^📊 Додати канал$'), add_channel),
+    MessageHandler(filters.TEXT & filters.Regex('^📜 Мої канали$'), list_channels),
+]
 
 # Додаємо обробники
 conv_handler = ConversationHandler(
     entry_points=[
         CommandHandler('start', start),
-        MessageHandler(filters.TEXT & filters.Regex('^📊 Додати канал$'), add_channel),
-        MessageHandler(filters.TEXT & filters.Regex('^📜 Мої канали$'), list_channels),
+        *menu_handlers,
     ],
     states={
-        SELECTING_ACTION: [
-            MessageHandler(filters.TEXT & filters.Regex('^📊 Додати канал$'), add_channel),
-            MessageHandler(filters.TEXT & filters.Regex('^📜 Мої канали$'), list_channels),
-        ],
+        SELECTING_ACTION: menu_handlers,
         WAITING_CHAT_ID: [MessageHandler(filters.TEXT, receive_chat_id)],
         WAITING_IMAGE_URL: [MessageHandler(filters.TEXT, receive_image_url)],
         WAITING_CAPTION: [MessageHandler(filters.TEXT, receive_caption)],
@@ -7,12 +7,27 @@
 import asyncio
 import json
 import hashlib
+import sys
+import time
 import aiohttp
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
+# Хеш-функція для відбитків зображень (BLAKE3, якщо встановлено, інакше SHA256)
+
+try:
+from blake3 import blake3 as hash_factory
+except ImportError:
+hash_factory = hashlib.sha256
+
+try:
+import orjson
+except ImportError:
+orjson = None  # type: ignore[assignment]
+
 logging.basicConfig(
 level=logging.INFO,
 format=’%(asctime)s - %(levelname)s - %(message)s’
@@ -23,180 +38,319 @@ class GraphenkoMonitor:
 “”“Клас для моніторингу стану графіків”””
 
 ```
-def __init__(self, config_file: str = 'graphenko-chats.json'):
+def __init__(self, config_file: str = 'graphenko-chats.json', concurrency: int = 16,
+             state_file: str = 'monitor_state.json') -> None:
     self.config_file = config_file
-    self.config = self._load_config()
+    self.state_file = Path(state_file)
+    self._config_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+    self.config: Dict[str, Any] = self._load_config()
     self.session: Optional[aiohttp.ClientSession] = None
-    self.image_hashes: Dict[str, str] = {}
-    self.stats = {
+    self.default_timeout = aiohttp.ClientTimeout(total=30)
+    self.fetch_semaphore = asyncio.Semaphore(concurrency)
+    self.image_hashes: Dict[str, bytes] = self._load_state()
+    self._state_dirty = False
+    # URL -> {'etag', 'last_modified', 'hash', 'size'} для умовних запитів
+    self.http_cache: Dict[str, Dict[str, Any]] = {}
+    # Адаптивний інтервал: чати без змін перевіряються рідше (лише в безперервному режимі)
+    self.base_interval: Optional[float] = None
+    self._chat_interval: Dict[str, float] = {}
+    self._chat_next_check: Dict[str, float] = {}
+    self.stats: Dict[str, Any] = {
         'total_checks': 0,
         'successful_downloads': 0,
+        'not_modified': 0,
         'failed_downloads': 0,
         'updates_detected': 0,
-        'errors': []
+        # Лише останні помилки, щоб пам'ять не росла при тривалому моніторингу
+        'errors': deque(maxlen=1000)
     }
 
 def _load_config(self) -> Dict[str, Any]:
-    """Завантажити конфігурацію"""
+    """Завантажити конфігурацію (з диска - лише якщо файл змінився)"""
     try:
-        if Path(self.config_file).exists():
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        path = Path(self.config_file)
+        if path.exists():
+            mtime_ns = path.stat().st_mtime_ns
+            if self._config_cache and self._config_cache[0] == mtime_ns:
+                return self._config_cache[1]
+            raw = path.read_bytes()
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            self._config_cache = (mtime_ns, config)
+            return config
     except Exception as e:
         logger.error(f"Помилка при завантаженні конфігурації: {e}")
     return {'chats': {}}
 
-async def init_session(self):
-    """Ініціалізувати HTTP сесію"""
+def _load_state(self) -> Dict[str, bytes]:
+    """Завантажити хеші, збережені попереднім запуском"""
+    try:
+        if self.state_file.exists():
+            raw = self.state_file.read_bytes()
+            state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            # Хеші іншого алгоритму (напр. BLAKE3 vs SHA256) не можна порівнювати
+            if state.get('algorithm') == hash_factory().name:
+                return {chat_id: bytes.fromhex(h) for chat_id, h in state['hashes'].items()}
+    except Exception as e:
+        logger.error("Помилка при завантаженні стану: %s", e)
+    return {}
+
+def _save_state(self) -> None:
+    """Атомарно зберегти хеші, щоб після перезапуску не починати з нуля"""
+    state = {
+        'algorithm': hash_factory().name,
+        'hashes': {chat_id: h.hex() for chat_id, h in self.image_hashes.items()}
+    }
+    raw = orjson.dumps(state) if orjson is not None else json.dumps(state).encode('utf-8')
+    try:
+        tmp_file = self.state_file.with_suffix('.tmp')
+        tmp_file.write_bytes(raw)
+        tmp_file.replace(self.state_file)
+        self._state_dirty = False
+    except Exception as e:
+        logger.error("Помилка при збереженні стану: %s", e)
+
+async def init_session(self) -> aiohttp.ClientSession:
+    """Ініціалізувати HTTP сесію і повернути її"""
     if self.session is None:
-        self.session = aiohttp.ClientSession()
+        # Теплий пул з'єднань і DNS-кеш між ітераціями моніторингу
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=16,
+            ttl_dns_cache=600,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+    return self.session
 
-async def close_session(self):
+async def close_session(self) -> None:
     """Закрити HTTP сесію"""
     if self.session:
         await self.session.close()
+        self.session = None
 
-async def fetch_image(self, url: str, timeout: int = 30) -> Optional[bytes]:
-    """Завантажити зображення з URL"""
-    await self.init_session()
+async def fetch_image(self, url: str, timeout: Optional[int] = None) -> Optional[Tuple[bytes, int]]:
+    """Завантажити зображення з URL і повернути (хеш, розмір у байтах)
+    
+    Хеш рахується потоково під час завантаження, тіло не зберігається в пам'яті.
+    Повторні запити умовні (If-None-Match / If-Modified-Since): на 304, або
+    якщо Last-Modified і Content-Length збігаються з попередньою відповіддю,
+    повертається збережений хеш без завантаження тіла і хешування.
+    """
+    session = await self.init_session()
+    
+    cached = self.http_cache.get(url)
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
     
     try:
-        async with self.session.get(
+        async with session.get(
             url, 
-            timeout=aiohttp.ClientTimeout(total=timeout)
+            headers=headers,
+            timeout=self.default_timeout if timeout is None else aiohttp.ClientTimeout(total=timeout)
         ) as resp:
+            if resp.status == 304 and cached:
+                self.stats['not_modified'] += 1
+                return cached['hash'], cached['size']
             if resp.status == 200:
+                if (cached and cached['last_modified']
+                        and resp.headers.get('Last-Modified') == cached['last_modified']
+                        and resp.headers.get('ETag') in (None, cached['etag'])
+                        and resp.content_length == cached['size']):
+                    # Сервер ігнорує умовний запит, але заголовки ті самі - тіло не читаємо
+                    self.stats['not_modified'] += 1
+                    return cached['hash'], cached['size']
+                hasher = hash_factory()
+                size = 0
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                digest = hasher.digest()
+                self.http_cache[url] = {
+                    'etag': resp.headers.get('ETag'),
+                    'last_modified': resp.headers.get('Last-Modified'),
+                    'hash': digest,
+                    'size': size
+                }
                 self.stats['successful_downloads'] += 1
-                return await resp.read()
+                return digest, size
             else:
-                logger.warning(f"HTTP {resp.status} для {url}")
+                logger.warning("HTTP %s для %s", resp.status, url)
                 self.stats['failed_downloads'] += 1
     except asyncio.TimeoutError:
-        logger.error(f"Timeout при завантаженні {url}")
+        logger.error("Timeout при завантаженні %s", url)
         self.stats['failed_downloads'] += 1
     except Exception as e:
-        logger.error(f"Помилка при завантаженні {url}: {e}")
+        logger.error("Помилка при завантаженні %s: %s", url, e)
         self.stats['failed_downloads'] += 1
     
     return None
 
-def calculate_hash(self, data: bytes) -> str:
-    """Розрахувати SHA256 хеш"""
-    return hashlib.sha256(data).hexdigest()
+async def _check_one(self, chat_id: str, chat_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Перевірити графік одного чату; повертає (розділ результатів, запис)"""
+    image_url = chat_data['image_url']
+    self.stats['total_checks'] += 1
+    
+    try:
+        logger.debug("Перевіряю %s...", chat_id)
+        async with self.fetch_semaphore:
+            fetched = await self.fetch_image(image_url)
+        
+        if not fetched:
+            return 'errors', {
+                'chat_id': chat_id,
+                'error': 'Не вдалося завантажити зображення'
+            }
+        
+        current_hash, image_size = fetched
+        prev_hash = self.image_hashes.get(chat_id)
+        
+        if prev_hash is None:
+            # Перший запуск
+            self.image_hashes[chat_id] = current_hash
+            self._state_dirty = True
+            return 'no_changes', {
+                'chat_id': chat_id,
+                'status': 'initialized'
+            }
+        elif prev_hash != current_hash:
+            # Графік оновлено!
+            logger.warning("🔴 ОНОВЛЕННЯ ВИЯВЛЕНО для %s!", chat_id)
+            self.image_hashes[chat_id] = current_hash
+            self._state_dirty = True
+            self.stats['updates_detected'] += 1
+            return 'updates', {
+                'chat_id': chat_id,
+                'url': image_url,
+                'timestamp': time.time_ns(),
+                'image_size': image_size,
+                'hash': current_hash[:8].hex() + '...'
+            }
+        else:
+            return 'no_changes', {
+                'chat_id': chat_id,
+                'hash': current_hash[:8].hex() + '...'
+            }
+    
+    except Exception as e:
+        logger.error("Помилка при перевірці %s: %s", chat_id, e)
+        self.stats['errors'].append({
+            'chat_id': chat_id,
+            'error': str(e),
+            'timestamp': time.time_ns()
+        })
+        return 'errors', {
+            'chat_id': chat_id,
+            'error': str(e)
+        }
+
+def _schedule_next(self, chat_id: str, quiet: bool) -> None:
+    """Запланувати наступну перевірку чату
+    
+    Без змін інтервал зростає в 1.5 раза (до 4x базового), після змін
+    або помилки повертається до базового.
+    """
+    if self.base_interval is None:
+        return
+    if quiet:
+        interval = min(
+            self._chat_interval.get(chat_id, self.base_interval) * 1.5,
+            self.base_interval * 4
+        )
+    else:
+        interval = self.base_interval
+    self._chat_interval[chat_id] = interval
+    self._chat_next_check[chat_id] = time.monotonic() + interval
 
 async def check_all_graphs(self) -> Dict[str, Any]:
     """Перевірити всі графіки на оновлення"""
-    results = {
-        'timestamp': datetime.now().isoformat(),
+    results: Dict[str, Any] = {
+        'timestamp': time.time_ns(),
         'total_chats': len(self.config['chats']),
         'updates': [],
         'no_changes': [],
-        'errors': []
+        'errors': [],
+        'skipped': 0
     }
     
+    # Усі чати перевіряємо паралельно (кількість запитів обмежує семафор);
+    # чати, яким ще не час, пропускаємо
+    now = time.monotonic()
+    checks = []
     for chat_id, chat_data in self.config['chats'].items():
-        image_url = chat_data.get('image_url')
-        if not image_url:
+        if not chat_data.get('image_url'):
             continue
-        
-        self.stats['total_checks'] += 1
-        
-        try:
-            logger.info(f"Перевіряю {chat_id}...")
-            image_data = await self.fetch_image(image_url)
-            
-            if not image_data:
-                results['errors'].append({
-                    'chat_id': chat_id,
-                    'error': 'Не вдалося завантажити зображення'
-                })
-                continue
-            
-            current_hash = self.calculate_hash(image_data)
-            prev_hash = self.image_hashes.get(chat_id)
-            
-            if prev_hash is None:
-                # Перший запуск
-                self.image_hashes[chat_id] = current_hash
-                results['no_changes'].append({
-                    'chat_id': chat_id,
-                    'status': 'initialized'
-                })
-            elif prev_hash != current_hash:
-                # Графік оновлено!
-                logger.warning(f"🔴 ОНОВЛЕННЯ ВИЯВЛЕНО для {chat_id}!")
-                self.image_hashes[chat_id] = current_hash
-                self.stats['updates_detected'] += 1
-                results['updates'].append({
-                    'chat_id': chat_id,
-                    'url': image_url,
-                    'timestamp': datetime.now().isoformat(),
-                    'image_size': len(image_data),
-                    'hash': current_hash[:16] + '...'
-                })
-            else:
-                results['no_changes'].append({
-                    'chat_id': chat_id,
-                    'hash': current_hash[:16] + '...'
-                })
-        
-        except Exception as e:
-            logger.error(f"Помилка при перевірці {chat_id}: {e}")
-            results['errors'].append({
-                'chat_id': chat_id,
-                'error': str(e)
-            })
-            self.stats['errors'].append({
-                'chat_id': chat_id,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            })
+        if self._chat_next_check.get(chat_id, 0) > now:
+            results['skipped'] += 1
+            continue
+        checks.append(self._check_one(chat_id, chat_data))
+    
+    for category, entry in await asyncio.gather(*checks):
+        results[category].append(entry)
+        self._schedule_next(
+            entry['chat_id'],
+            quiet=category == 'no_changes' and entry.get('status') != 'initialized'
+        )
+    
+    if self._state_dirty:
+        # Запис на диск - у потоці, щоб не блокувати цикл подій
+        await asyncio.to_thread(self._save_state)
     
     return results
 
-def print_results(self, results: Dict[str, Any]):
-    """Вивести результати в консоль"""
-    print("\n" + "="*60)
-    print(f"📊 Результати перевірки графіків")
-    print(f"⏰ {results['timestamp']}")
-    print("="*60)
+def print_results(self, results: Dict[str, Any]) -> None:
+    """Вивести результати в консоль (одним записом у stdout)"""
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append(f"📊 Результати перевірки графіків")
+    lines.append(f"⏰ {datetime.fromtimestamp(results['timestamp'] / 1e9).isoformat()}")
+    lines.append("="*60)
     
-    print(f"\n📈 Статистика:")
-    print(f"  • Всього каналів: {results['total_chats']}")
-    print(f"  • Перевірено: {self.stats['total_checks']}")
-    print(f"  • Оновлено: {len(results['updates'])} 🔴")
-    print(f"  • Без змін: {len(results['no_changes'])} ✅")
-    print(f"  • Помилок: {len(results['errors'])} ⚠️")
+    lines.append(f"\n📈 Статистика:")
+    lines.append(f"  • Всього каналів: {results['total_chats']}")
+    lines.append(f"  • Перевірено: {self.stats['total_checks']}")
+    lines.append(f"  • Оновлено: {len(results['updates'])} 🔴")
+    lines.append(f"  • Без змін: {len(results['no_changes'])} ✅")
+    lines.append(f"  • Відкладено: {results['skipped']} 💤")
+    lines.append(f"  • Помилок: {len(results['errors'])} ⚠️")
     
     if results['updates']:
-        print(f"\n🔴 ОНОВЛЕНІ ГРАФІКИ:")
+        lines.append(f"\n🔴 ОНОВЛЕНІ ГРАФІКИ:")
         for update in results['updates']:
-            print(f"  • {update['chat_id']}")
-            print(f"    URL: {update['url'][:50]}...")
-            print(f"    Розмір: {update['image_size'] // 1024} KB")
-            print(f"    Хеш: {update['hash']}")
-            print()
+            lines.append(f"  • {update['chat_id']}")
+            lines.append(f"    URL: {update['url'][:50]}...")
+            lines.append(f"    Розмір: {update['image_size'] // 1024} KB")
+            lines.append(f"    Хеш: {update['hash']}")
+            lines.append('')
     
     if results['errors']:
-        print(f"\n⚠️ ПОМИЛКИ:")
+        lines.append(f"\n⚠️ ПОМИЛКИ:")
         for error in results['errors']:
-            print(f"  • {error['chat_id']}: {error['error']}")
+            lines.append(f"  • {error['chat_id']}: {error['error']}")
     
-    print(f"\n📊 ЗАГАЛЬНА СТАТИСТИКА:")
-    print(f"  • Успішних завантажень: {self.stats['successful_downloads']}")
-    print(f"  • Помилок завантаження: {self.stats['failed_downloads']}")
-    print(f"  • Всього виявлено оновлень: {self.stats['updates_detected']}")
-    print("="*60 + "\n")
+    lines.append(f"\n📊 ЗАГАЛЬНА СТАТИСТИКА:")
+    lines.append(f"  • Успішних завантажень: {self.stats['successful_downloads']}")
+    lines.append(f"  • Без змін на сервері: {self.stats['not_modified']}")
+    lines.append(f"  • Помилок завантаження: {self.stats['failed_downloads']}")
+    lines.append(f"  • Всього виявлено оновлень: {self.stats['updates_detected']}")
+    lines.append("="*60 + "\n")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-async def continuous_monitor(self, interval: int = 300):
+async def continuous_monitor(self, interval: int = 300) -> None:
     """Безперервний моніторинг з інтервалом"""
     logger.info(f"Запускаю безперервний моніторинг (інтервал: {interval}с)")
+    self.base_interval = interval
     
     try:
         iteration = 0
         while True:
             iteration += 1
             logger.info(f"\n--- Ітерація #{iteration} ---")
+            # Підхопити канали, додані через бота (без змін файлу - з кешу)
+            self.config = self._load_config()
             results = await self.check_all_graphs()
             self.print_results(results)
             